@@ -14,5 +14,17 @@ class Config:
         "fred": os.path.join(DATA_LAKE_PATHS["bronze"], "fred"),
     }
 
+    # Local cache for provider (FRED, Kaggle, yfinance) responses
+    CACHE_PATH = os.getenv("MERCURY_CACHE_PATH", os.path.join(BASE_PATH, ".cache"))
+    CACHE_TTL_SECONDS = int(os.getenv("MERCURY_CACHE_TTL_SECONDS", 24 * 60 * 60))
+    CACHE_MAX_BYTES = int(os.getenv("MERCURY_CACHE_MAX_BYTES", 2 * 1024 ** 3))
+    CACHE_MODE = os.getenv("MERCURY_CACHE_MODE", "online")  # online | refresh | offline
+
+    # Bronze storage format for Kaggle archive members: "csv" (as shipped) or "parquet"
+    KAGGLE_BRONZE_FORMAT = os.getenv("MERCURY_KAGGLE_BRONZE_FORMAT", "csv")
+
+    # Run manifest (lineage index) and per-dataset output snapshots
+    LINEAGE_PATH = os.path.join(BASE_PATH, "_lineage")
+
     RETENTION_LIMIT = 4
     INDICATORS = ["FEDFUNDS", "CPIAUCSL", "GDP", "UNRATE", "DGS10"]
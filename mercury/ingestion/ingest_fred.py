@@ -1,26 +1,42 @@
 import os
+import pandas as pd
 from fredapi import Fred
 from dotenv import load_dotenv
 from mercury.config import Config
+from mercury.ingestion.provider_cache import ProviderCache
 from mercury.utils import save_csv
 
 load_dotenv()
 
 
-def ingest_fred():
+def fetch_series(fred, cache: ProviderCache, indicator: str) -> pd.Series:
+    blob_path = cache.fetch(
+        {"series_id": indicator},
+        loader=lambda path: fred.get_series(indicator).to_pickle(path),
+        # FRED exposes a cheap `last_updated` stamp per series, used to revalidate expired entries
+        validator=lambda: str(fred.get_series_info(indicator)["last_updated"]),
+    )
+    return pd.read_pickle(blob_path)
+
+
+def ingest_fred() -> bool:
+    cache = ProviderCache("fred")
     api_key = os.getenv("FRED_API_KEY")
-    if not api_key:
+    if not api_key and not cache.offline:
         raise ValueError("Missing `FRED_API_KEY`. Check `.env` configuration.")
 
-    fred = Fred(api_key=api_key)
+    # Offline replay never calls the client, so it can run without credentials
+    fred = Fred(api_key=api_key) if api_key else None
 
     try:
         for indicator in Config.INDICATORS:
-            df = fred.get_series(indicator).reset_index(name="Value")
+            df = fetch_series(fred, cache, indicator).reset_index(name="Value")
             df.rename(columns={"index": "Date"}, inplace=True)
             save_csv(df, Config.BRONZE_PATHS["fred"], f"{indicator}.csv", prefix="raw_")
     except Exception as e:
         print(f"Error processing indicator: {e}")
+        return False
+    return True
 
 
 def main():
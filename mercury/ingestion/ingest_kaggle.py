@@ -1,42 +1,172 @@
+import io
 import os
-import pandas as pd
-from kaggle.api.kaggle_api_extended import KaggleApi
+import csv
+import json
+import shutil
+import zipfile
+import tempfile
+from typing import TYPE_CHECKING, Optional
 from mercury.config import Config
-from mercury.utils import ensure_directory_exists, save_csv
+from mercury.ingestion.provider_cache import ProviderCache
+from mercury.utils import ensure_directory_exists, file_sha256
 
+if TYPE_CHECKING:
+    from kaggle.api.kaggle_api_extended import KaggleApi
 
-def ingest_kaggle():
+DATASET = "andrewmvd/sp-500-stocks"
+BRONZE_FORMATS = ("csv", "parquet")
+ARCHIVE_STATE_FILE = "_archive.json"
+
+# Numeric columns across the archive members; every other column is stored as a string
+NUMERIC_COLUMNS = {
+    "Adj Close", "Close", "High", "Low", "Open", "Volume", "S&P500",
+    "Currentprice", "Marketcap", "Ebitda", "Revenuegrowth", "Fulltimeemployees", "Weight",
+}
+
+
+def download_archive(api: "KaggleApi", target_path: str) -> None:
+    # The Kaggle client names the archive itself, so download into a scratch dir and move it
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        api.dataset_download_files(DATASET, path=tmp_dir, unzip=False)
+        archive = next(f for f in os.listdir(tmp_dir) if f.endswith(".zip"))
+        shutil.move(os.path.join(tmp_dir, archive), target_path)
+
+
+def dataset_last_updated(api: "KaggleApi") -> str:
+    owner, slug = DATASET.split("/")
+    for dataset in api.dataset_list(user=owner, search=slug):
+        if str(dataset.ref) == DATASET:
+            return str(dataset.lastUpdated)
+    raise LookupError(f"Dataset '{DATASET}' not found in listing.")
+
+
+def fetch_archive(api: "KaggleApi", cache: ProviderCache) -> str:
+    return cache.fetch(
+        {"dataset": DATASET},
+        loader=lambda path: download_archive(api, path),
+        validator=lambda: dataset_last_updated(api),
+    )
+
+
+def read_archive_state(kaggle_path: str) -> dict:
+    state_path = os.path.join(kaggle_path, ARCHIVE_STATE_FILE)
+    if not os.path.exists(state_path):
+        return {}
+    with open(state_path) as f:
+        return json.load(f)
+
+
+def write_archive_state(kaggle_path: str, state: dict) -> None:
+    with open(os.path.join(kaggle_path, ARCHIVE_STATE_FILE), "w") as f:
+        json.dump(state, f, indent=2)
+
+
+def is_unchanged(kaggle_path: str, checksum: str, file_format: str) -> bool:
+    state = read_archive_state(kaggle_path)
+    return (
+        state.get("sha256") == checksum
+        and state.get("format") == file_format
+        and all(os.path.exists(os.path.join(kaggle_path, f)) for f in state.get("files", []))
+    )
+
+
+def read_header(archive: zipfile.ZipFile, member: zipfile.ZipInfo) -> list:
+    with archive.open(member) as source:
+        return next(csv.reader(io.TextIOWrapper(source, encoding="utf-8")))
+
+
+def stream_member_to_parquet(source, target_path: str, column_names: list) -> None:
+    try:
+        import pyarrow as pa
+        from pyarrow import csv as pa_csv
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Parquet output requires `pyarrow`. Install it or set the format to 'csv'.") from e
+
+    # Pin every column type up front: Arrow otherwise infers from the first block only and
+    # fails mid-stream when a column that was empty there holds values later on
+    column_types = {name: pa.float64() if name in NUMERIC_COLUMNS else pa.string() for name in column_names}
+
+    # Convert batch by batch so the member is never fully materialized in memory
+    # Treat empty strings as null, matching pandas' CSV NA handling so silver is format-independent
+    convert_options = pa_csv.ConvertOptions(column_types=column_types, strings_can_be_null=True)
+    reader = pa_csv.open_csv(source, convert_options=convert_options)
+    with pq.ParquetWriter(target_path, reader.schema) as writer:
+        for batch in reader:
+            writer.write_batch(batch)
+
+
+def extract_member(archive: zipfile.ZipFile, member: zipfile.ZipInfo, kaggle_path: str, file_format: str) -> str:
+    base_name = os.path.splitext(os.path.basename(member.filename))[0]
+    file_name = f"raw_{base_name}.{file_format}"
+    target_path = os.path.join(kaggle_path, file_name)
+    tmp_path = f"{target_path}.tmp"
+
+    try:
+        column_names = read_header(archive, member) if file_format == "parquet" else None
+        with archive.open(member) as source:
+            if file_format == "parquet":
+                stream_member_to_parquet(source, tmp_path, column_names)
+            else:
+                with open(tmp_path, "wb") as target:
+                    shutil.copyfileobj(source, target)
+        os.replace(tmp_path, target_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    print(f"Extracted '{member.filename}' to: {target_path}")
+    return file_name
+
+
+def ingest_kaggle(file_format: Optional[str] = None) -> bool:
     kaggle_path = Config.BRONZE_PATHS["kaggle"]
     ensure_directory_exists(kaggle_path)  # Ensure the target directory exists
+    file_format = (file_format or Config.KAGGLE_BRONZE_FORMAT).lower()
+    if file_format not in BRONZE_FORMATS:
+        raise ValueError(f"Invalid Kaggle bronze format '{file_format}'. Expected one of {BRONZE_FORMATS}.")
 
-    api = KaggleApi()
-    api.authenticate()  # Authenticate with Kaggle API
+    cache = ProviderCache("kaggle")
+    api = None
+    if not cache.offline:
+        # Importing `kaggle` authenticates immediately, so offline replay must not import it
+        from kaggle.api.kaggle_api_extended import KaggleApi
 
-    try:
-        # Download and unzip the dataset
-        api.dataset_download_files("andrewmvd/sp-500-stocks", path=kaggle_path, unzip=True)
+        api = KaggleApi()
+        api.authenticate()  # Authenticate with Kaggle API
 
-        # Iterate through all CSV files in the directory
-        for file in [f for f in os.listdir(kaggle_path) if f.endswith(".csv")]:
-            file_path = os.path.join(kaggle_path, file)
+    try:
+        # Fetch the dataset archive (from the local cache when possible)
+        archive_path = fetch_archive(api, cache)
+        meta = cache.lookup({"dataset": DATASET}) or {}
+        checksum = meta.get("sha256") or file_sha256(archive_path)
 
-            # Load the CSV into a DataFrame
-            df = pd.read_csv(file_path)
+        if is_unchanged(kaggle_path, checksum, file_format):
+            print(f"Archive unchanged (sha256 {checksum[:12]}). Skipping extraction.")
+            return True
 
-            # Check if the file already has the "raw_" prefix
-            if not file.startswith("raw_"):
-                # Save the new file with the prefix
-                save_csv(df, kaggle_path, file, prefix="raw_")
+        # Stream each CSV member straight into bronze under its final name
+        with zipfile.ZipFile(archive_path) as archive:
+            files = [
+                extract_member(archive, member, kaggle_path, file_format)
+                for member in archive.infolist()
+                if member.filename.endswith(".csv")
+            ]
 
-            # Delete the old file to clean up the directory
-            os.remove(file_path)
+        # Drop files from the previous extraction that this one did not produce (e.g. after a format switch)
+        for stale_file in set(read_archive_state(kaggle_path).get("files", [])) - set(files):
+            stale_path = os.path.join(kaggle_path, stale_file)
+            if os.path.exists(stale_path):
+                os.remove(stale_path)
+                print(f"Removed stale file: {stale_path}")
 
-            # Log the deletion for better traceability
-            print(f"Deleted old file: {file_path}")
+        write_archive_state(kaggle_path, {"sha256": checksum, "format": file_format, "files": files})
 
     except Exception as e:
         # Handle and log any errors during the process
         print(f"Error during Kaggle data ingestion: {e}")
+        return False
+    return True
 
 
 def main():
@@ -1,15 +1,21 @@
 import os
+import time
 import logging
-from typing import List
+from typing import List, Optional
+import pandas as pd
 import yfinance as yf
-from mercury.utils import ensure_directory_exists, load_csv
+from mercury.config import Config
+from mercury.ingestion.provider_cache import ProviderCache
+from mercury.lineage import LineageIndex
+from mercury.utils import ensure_directory_exists, load_table
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)s | %(message)s")
 
 # File paths
-COMPANIES_FILE = "data-lake/bronze/kaggle/raw_sp500_companies.csv"
+COMPANIES_FILE = os.path.join(Config.BRONZE_PATHS["kaggle"], f"raw_sp500_companies.{Config.KAGGLE_BRONZE_FORMAT}")
 YFINANCE_DIR = "data-lake/bronze/yfinance"
+START_DATE = "1995-01-01"
 
 
 def extract_symbols(file_path: str) -> List[str]:
@@ -18,7 +24,7 @@ def extract_symbols(file_path: str) -> List[str]:
         raise FileNotFoundError(f"Input file not found: {file_path}")
 
     logging.info(f"Extracting symbols from {file_path}...")
-    companies = load_csv(file_path)
+    companies = load_table(file_path)
     if "Symbol" not in companies.columns:
         raise ValueError("Required column 'Symbol' is missing in the input file.")
 
@@ -27,10 +33,28 @@ def extract_symbols(file_path: str) -> List[str]:
     return symbols
 
 
-def fetch_data_for_symbol(symbol: str, output_path: str, start_date: str) -> bool:
+def download_history(symbol: str, start_date: str, target_path: str) -> None:
+    data = yf.Ticker(symbol).history(start=start_date, auto_adjust=False)
+    # yfinance reports most failures as an empty frame; raise so the failure is not cached
+    if data.empty:
+        raise ValueError(f"{symbol}: No data returned by yfinance.")
+    data.to_pickle(target_path)
+
+
+def load_history(symbol: str, start_date: str, cache: Optional[ProviderCache] = None) -> pd.DataFrame:
+    cache = cache or ProviderCache("yfinance")
+    blob_path = cache.fetch(
+        {"symbol": symbol, "start": start_date, "auto_adjust": False},
+        loader=lambda path: download_history(symbol, start_date, path),
+    )
+    return pd.read_pickle(blob_path)
+
+
+def fetch_data_for_symbol(symbol: str, output_path: str, start_date: str,
+                          cache: Optional[ProviderCache] = None) -> bool:
     try:
         logging.info(f"Fetching data for {symbol}...")
-        data = yf.Ticker(symbol).history(start=start_date, auto_adjust=False)
+        data = load_history(symbol, start_date, cache)
 
         if not data.empty:
             data.index.name = "Date"
@@ -45,8 +69,9 @@ def fetch_data_for_symbol(symbol: str, output_path: str, start_date: str) -> boo
         return False
 
 
-def fetch_and_save_data(symbols: List[str], output_dir: str, start_date: str = "1995-01-01"):
+def fetch_and_save_data(symbols: List[str], output_dir: str, start_date: str = START_DATE) -> int:
     ensure_directory_exists(output_dir)
+    cache = ProviderCache("yfinance")
     total_symbols = len(symbols)
     success_count = 0
     failed_symbols = []
@@ -59,7 +84,7 @@ def fetch_and_save_data(symbols: List[str], output_dir: str, start_date: str = "
             logging.info(f"{symbol}: File already exists. Skipping...")
             continue
 
-        success = fetch_data_for_symbol(symbol, file_path, start_date)
+        success = fetch_data_for_symbol(symbol, file_path, start_date, cache)
         if success:
             success_count += 1
         else:
@@ -68,12 +93,19 @@ def fetch_and_save_data(symbols: List[str], output_dir: str, start_date: str = "
     logging.info(f"Data fetch completed: {success_count}/{total_symbols} tickers succeeded.")
     if failed_symbols:
         logging.error(f"Failed to fetch data for {len(failed_symbols)} tickers: {failed_symbols}")
+    return len(failed_symbols)
 
 
 if __name__ == "__main__":
     try:
+        started_at = time.time()
         symbols = extract_symbols(COMPANIES_FILE)
-        fetch_and_save_data(symbols, YFINANCE_DIR)
-        logging.info("Completed fetching all available data.")
+        failed_count = fetch_and_save_data(symbols, YFINANCE_DIR, START_DATE)
+        if failed_count:
+            logging.error(f"{failed_count} tickers failed. Not recording this run.")
+        else:
+            LineageIndex().record("ingest_yfinance", inputs=[COMPANIES_FILE], outputs=[YFINANCE_DIR],
+                                  params={"start_date": START_DATE}, started_at=started_at, finished_at=time.time())
+            logging.info("Completed fetching all available data.")
     except Exception as e:
         logging.error(f"Process failed: {e}")
\ No newline at end of file
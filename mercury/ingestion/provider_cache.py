@@ -0,0 +1,175 @@
+import os
+import json
+import time
+import hashlib
+import logging
+from typing import Callable, Optional
+from mercury.config import Config
+from mercury.utils import ensure_directory_exists, file_sha256
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)s | %(message)s")
+
+CACHE_MODES = ("online", "refresh", "offline")
+
+
+class CacheMissError(LookupError):
+    """Raised in offline mode when a request has no recorded response."""
+
+
+class ProviderCache:
+    """
+    On-disk cache of provider responses, keyed by a hash of the request parameters.
+
+    Each entry is a blob written by the caller's loader plus a JSON sidecar holding the
+    request parameters, content hash, validator and access times. Modes:
+      - online: serve fresh entries, revalidate or re-fetch expired ones.
+      - refresh: always re-fetch and overwrite the entry.
+      - offline: replay recorded entries regardless of age; never touch the network.
+    """
+
+    def __init__(self, provider: str, cache_dir: Optional[str] = None, ttl: Optional[int] = None,
+                 max_bytes: Optional[int] = None, mode: Optional[str] = None):
+        self.provider = provider
+        self.root = cache_dir or Config.CACHE_PATH
+        self.path = os.path.join(self.root, provider)
+        self.ttl = Config.CACHE_TTL_SECONDS if ttl is None else ttl
+        self.max_bytes = Config.CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self.mode = (mode or Config.CACHE_MODE).lower()
+        if self.mode not in CACHE_MODES:
+            raise ValueError(f"Invalid cache mode '{self.mode}'. Expected one of {CACHE_MODES}.")
+        ensure_directory_exists(self.path)
+
+    @property
+    def offline(self) -> bool:
+        return self.mode == "offline"
+
+    def key(self, params: dict) -> str:
+        payload = json.dumps({"provider": self.provider, **params}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _blob_path(self, key: str) -> str:
+        return os.path.join(self.path, f"{key}.blob")
+
+    def _meta_path(self, key: str) -> str:
+        return os.path.join(self.path, f"{key}.json")
+
+    def _read_meta(self, key: str) -> Optional[dict]:
+        meta_path = self._meta_path(key)
+        if not (os.path.exists(meta_path) and os.path.exists(self._blob_path(key))):
+            return None
+        try:
+            with open(meta_path) as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logging.warning(f"[{self.provider}] Ignoring unreadable cache entry {key[:12]}: {e}")
+            return None
+
+    def _write_meta(self, key: str, meta: dict) -> None:
+        tmp_path = f"{self._meta_path(key)}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(meta, f, indent=2, default=str)
+        os.replace(tmp_path, self._meta_path(key))
+
+    def _touch(self, key: str, meta: dict, **updates) -> dict:
+        meta.update(updates, last_access=time.time())
+        self._write_meta(key, meta)
+        return meta
+
+    def lookup(self, params: dict) -> Optional[dict]:
+        """Return the metadata of the recorded entry for `params`, or None."""
+        return self._read_meta(self.key(params))
+
+    def fetch(self, params: dict, loader: Callable[[str], None],
+              validator: Optional[Callable[[], Optional[str]]] = None) -> str:
+        """
+        Return the path of the cached blob for `params`, calling `loader(target_path)` to
+        (re)populate it when needed. `validator` returns a cheap freshness token from the
+        source (e.g. a last-updated timestamp); an expired entry whose token is unchanged
+        is kept without re-downloading.
+        """
+        key = self.key(params)
+        meta = self._read_meta(key)
+
+        if self.offline:
+            if meta is None:
+                raise CacheMissError(f"[{self.provider}] No recorded response for {params} (offline mode).")
+            self._touch(key, meta)
+            logging.info(f"[{self.provider}] Replaying recorded response for {params}.")
+            return self._blob_path(key)
+
+        if meta is not None and self.mode == "online" and time.time() - meta["fetched_at"] < self.ttl:
+            self._touch(key, meta)
+            logging.info(f"[{self.provider}] Cache hit for {params}.")
+            return self._blob_path(key)
+
+        # In refresh mode the token is never compared; it is only stored so that later
+        # online runs can revalidate this entry instead of re-downloading it.
+        token = None
+        if validator is not None:
+            try:
+                token = validator()
+            except Exception as e:
+                logging.warning(f"[{self.provider}] Could not read validator for {params}: {e}")
+
+        if meta is not None and self.mode == "online" and token is not None and token == meta.get("validator"):
+            self._touch(key, meta, fetched_at=time.time())
+            logging.info(f"[{self.provider}] Cache revalidated (unchanged) for {params}.")
+            return self._blob_path(key)
+
+        logging.info(f"[{self.provider}] Fetching {params} from source...")
+        blob_path = self._blob_path(key)
+        tmp_path = f"{blob_path}.tmp"
+        try:
+            loader(tmp_path)
+            os.replace(tmp_path, blob_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        now = time.time()
+        self._write_meta(key, {
+            "provider": self.provider,
+            "params": params,
+            "sha256": file_sha256(blob_path),
+            "size": os.path.getsize(blob_path),
+            "validator": token,
+            "fetched_at": now,
+            "last_access": now,
+        })
+        self.evict(keep=blob_path)
+        return blob_path
+
+    def evict(self, keep: Optional[str] = None) -> None:
+        """Drop least recently used entries across all providers until under `max_bytes`."""
+        entries = []
+        for provider in os.listdir(self.root):
+            provider_path = os.path.join(self.root, provider)
+            if not os.path.isdir(provider_path):
+                continue
+            for file in os.listdir(provider_path):
+                if not file.endswith(".json"):
+                    continue
+                meta_path = os.path.join(provider_path, file)
+                blob_path = meta_path[: -len(".json")] + ".blob"
+                if blob_path == keep:
+                    continue
+                try:
+                    with open(meta_path) as f:
+                        last_access = json.load(f).get("last_access", 0)
+                    size = os.path.getsize(blob_path)
+                except (OSError, ValueError):
+                    continue
+                entries.append((last_access, size, meta_path, blob_path))
+
+        total = sum(size for _, size, _, _ in entries)
+        if keep is not None and os.path.exists(keep):
+            total += os.path.getsize(keep)
+        for _, size, meta_path, blob_path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            for path in (meta_path, blob_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            total -= size
+            logging.info(f"Evicted cache entry: {blob_path}")
@@ -0,0 +1,205 @@
+import os
+import csv
+import json
+import time
+import shutil
+import logging
+from typing import Callable, Dict, List, Optional
+from mercury.config import Config
+from mercury.utils import ensure_directory_exists, file_sha256
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)s | %(message)s")
+
+DATA_EXTENSIONS = (".csv", ".parquet")
+
+
+def expand_paths(paths: List[str]) -> List[str]:
+    """Expand directories into the data files they contain; missing paths are kept as-is."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(
+                os.path.join(path, f) for f in sorted(os.listdir(path))
+                if f.endswith(DATA_EXTENSIONS) and not f.startswith(("_", "."))
+            )
+        else:
+            files.append(path)
+    return files
+
+
+def count_rows(file_path: str) -> Optional[int]:
+    try:
+        if file_path.endswith(".parquet"):
+            import pyarrow.parquet as pq
+            return pq.ParquetFile(file_path).metadata.num_rows
+        # Stream through the csv module so quoted fields with embedded newlines count once
+        with open(file_path, newline="", encoding="utf-8") as f:
+            return max(sum(1 for _ in csv.reader(f)) - 1, 0)
+    except Exception as e:
+        logging.warning(f"Could not count rows in '{file_path}': {e}")
+        return None
+
+
+def hash_files(paths: List[str]) -> Dict[str, Optional[str]]:
+    return {path: file_sha256(path) if os.path.exists(path) else None for path in expand_paths(paths)}
+
+
+def dataset_name(file_path: str) -> str:
+    relative = os.path.relpath(file_path, Config.BASE_PATH)
+    return os.path.splitext(relative)[0].replace(os.sep, "__")
+
+
+class LineageIndex:
+    """
+    Append-only run manifest stored as JSON lines under `Config.LINEAGE_PATH`.
+
+    Each stage run records its input and output hashes, row counts, parameters and timings.
+    Outputs are also snapshotted by content hash; `prune` keeps the snapshots referenced by the
+    newest `Config.RETENTION_LIMIT` entries per stage and deletes the rest.
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or Config.LINEAGE_PATH
+        self.manifest_path = os.path.join(self.root, "manifest.jsonl")
+        self.snapshot_path = os.path.join(self.root, "snapshots")
+        ensure_directory_exists(self.snapshot_path)
+
+    def entries(self, stage: Optional[str] = None) -> List[dict]:
+        if not os.path.exists(self.manifest_path):
+            return []
+        with open(self.manifest_path) as f:
+            entries = [json.loads(line) for line in f if line.strip()]
+        return [e for e in entries if stage is None or e["stage"] == stage]
+
+    def latest(self, stage: str) -> Optional[dict]:
+        entries = self.entries(stage)
+        return entries[-1] if entries else None
+
+    def stale_reasons(self, stage: str, inputs: List[str], outputs: List[str],
+                      params: Optional[dict] = None) -> List[str]:
+        """Return why `stage` needs to run again; an empty list means its outputs are current."""
+        entry = self.latest(stage)
+        if entry is None:
+            return ["no previous run"]
+
+        reasons = []
+        if entry["params"] != json.loads(json.dumps(params or {}, default=str)):
+            reasons.append("parameters changed")
+
+        current_inputs = hash_files(inputs)
+        if current_inputs != entry["inputs"]:
+            changed = sorted(set(current_inputs.items()) ^ set(entry["inputs"].items()))
+            reasons.append(f"inputs changed: {sorted({path for path, _ in changed})}")
+
+        recorded_outputs = {o["path"]: o["sha256"] for o in entry["outputs"]}
+        # Check recorded outputs too, so a file deleted from an output directory is caught
+        for path in sorted(set(expand_paths(outputs)) | set(recorded_outputs)):
+            if not os.path.exists(path):
+                reasons.append(f"output missing: {path}")
+            elif recorded_outputs.get(path) != file_sha256(path):
+                reasons.append(f"output modified: {path}")
+        return reasons
+
+    def is_stale(self, stage: str, inputs: List[str], outputs: List[str], params: Optional[dict] = None) -> bool:
+        return bool(self.stale_reasons(stage, inputs, outputs, params))
+
+    def snapshot(self, file_path: str, checksum: str) -> str:
+        dataset_dir = os.path.join(self.snapshot_path, dataset_name(file_path))
+        ensure_directory_exists(dataset_dir)
+        target_path = os.path.join(dataset_dir, f"{checksum[:16]}{os.path.splitext(file_path)[1]}")
+        if not os.path.exists(target_path):
+            shutil.copy2(file_path, target_path)
+        return target_path
+
+    def record(self, stage: str, inputs: List[str], outputs: List[str], params: Optional[dict] = None,
+               started_at: Optional[float] = None, finished_at: Optional[float] = None,
+               input_hashes: Optional[Dict[str, Optional[str]]] = None) -> dict:
+        finished_at = finished_at or time.time()
+        output_entries = []
+        for path in expand_paths(outputs):
+            if not os.path.exists(path):
+                logging.warning(f"[{stage}] Expected output not found: {path}")
+                continue
+            checksum = file_sha256(path)
+            output_entries.append({
+                "path": path,
+                "sha256": checksum,
+                "rows": count_rows(path),
+                "snapshot": self.snapshot(path, checksum),
+            })
+
+        entry = {
+            "stage": stage,
+            "params": params or {},
+            "inputs": input_hashes if input_hashes is not None else hash_files(inputs),
+            "outputs": output_entries,
+            "started_at": started_at or finished_at,
+            "finished_at": finished_at,
+            "duration_seconds": round(finished_at - (started_at or finished_at), 3),
+        }
+        with open(self.manifest_path, "a") as f:
+            f.write(json.dumps(entry, default=str) + "\n")
+        logging.info(f"[{stage}] Recorded run with {len(output_entries)} output(s).")
+        return entry
+
+    def prune(self, limit: Optional[int] = None) -> None:
+        """
+        Keep the newest `limit` manifest entries per stage, then delete every snapshot that no kept
+        entry references, so each stage keeps at most `limit` versions of each output.
+        """
+        limit = Config.RETENTION_LIMIT if limit is None else limit
+
+        entries = self.entries()
+        kept, seen = [], {}
+        for entry in reversed(entries):
+            seen[entry["stage"]] = seen.get(entry["stage"], 0) + 1
+            if seen[entry["stage"]] <= limit:
+                kept.append(entry)
+        kept.reverse()
+        if len(kept) < len(entries):
+            tmp_path = f"{self.manifest_path}.tmp"
+            with open(tmp_path, "w") as f:
+                f.writelines(json.dumps(e, default=str) + "\n" for e in kept)
+            os.replace(tmp_path, self.manifest_path)
+            logging.info(f"Pruned {len(entries) - len(kept)} manifest entries.")
+
+        referenced = {os.path.normpath(o["snapshot"]) for e in kept for o in e["outputs"]}
+        for dataset in os.listdir(self.snapshot_path):
+            dataset_dir = os.path.join(self.snapshot_path, dataset)
+            for file in os.listdir(dataset_dir):
+                path = os.path.join(dataset_dir, file)
+                if os.path.normpath(path) not in referenced:
+                    os.remove(path)
+                    logging.info(f"Pruned snapshot: {path}")
+            if not os.listdir(dataset_dir):
+                os.rmdir(dataset_dir)
+
+
+def run_stage(stage: str, func: Callable[[], bool], inputs: List[str], outputs: List[str],
+              params: Optional[dict] = None, index: Optional[LineageIndex] = None, force: bool = False) -> bool:
+    """
+    Run `func` only if the stage is stale (or `force` is set) and record it. `func` returns whether
+    it succeeded; failed runs are not recorded, so the stage stays stale. Returns whether a run was recorded.
+    """
+    index = index or LineageIndex()
+    reasons = ["forced"] if force else index.stale_reasons(stage, inputs, outputs, params)
+    if not reasons:
+        logging.info(f"[{stage}] Up to date. Skipping.")
+        return False
+
+    logging.info(f"[{stage}] Running ({'; '.join(reasons)})...")
+    input_hashes = hash_files(inputs)
+    started_at = time.time()
+    try:
+        success = func()
+    except Exception as e:
+        logging.error(f"[{stage}] Failed with error: {e}")
+        success = False
+    if not success:
+        logging.error(f"[{stage}] Failed. Not recording this run.")
+        return False
+
+    index.record(stage, inputs, outputs, params, started_at=started_at, finished_at=time.time(),
+                 input_hashes=input_hashes)
+    return True
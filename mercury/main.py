@@ -1,16 +1,113 @@
+import os
+import time
 import logging
+import argparse
+from mercury.config import Config
 from mercury.ingestion.ingest_fred import ingest_fred
+from mercury.ingestion.ingest_kaggle import ingest_kaggle, DATASET as KAGGLE_DATASET
+from mercury.lineage import LineageIndex, run_stage
+from mercury.transformation.transform_fred_to_silver import transform_fred_to_silver, SILVER_PATH as MACRO_SILVER_PATH
+from mercury.transformation.transform_kaggle_to_silver import transform_to_silver_kaggle
+from mercury.transformation.market_metrics import process_market_metrics
+from mercury.utils import load_csv
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)s | %(message)s")
 
+FRED_BRONZE_FILES = [os.path.join(Config.BRONZE_PATHS["fred"], f"raw_{i}.csv") for i in Config.INDICATORS]
+KAGGLE_SILVER_PATH = os.path.join(Config.DATA_LAKE_PATHS["silver"], "stocks")
+FRED_START_DATE = "1995-01-01"
+MARKET_INDEX_FILE = os.path.join(KAGGLE_SILVER_PATH, "cleaned_sp500_index.csv")
+MARKET_METRICS_PATH = os.path.join(Config.DATA_LAKE_PATHS["silver"], "analytics", "market")
+
+
+def build_market_metrics() -> bool:
+    process_market_metrics(load_csv(MARKET_INDEX_FILE), MARKET_METRICS_PATH, prefix="processed_")
+    return True
+
+
+# Ingestion stages always run (the provider cache decides what is re-downloaded) and are
+# recorded only when they succeed, so the manifest never points at a previous run's files.
+INGEST_STAGES = [
+    {
+        "stage": "ingest_fred",
+        "func": ingest_fred,
+        "outputs": FRED_BRONZE_FILES,
+        "params": {"indicators": Config.INDICATORS},
+    },
+    {
+        "stage": "ingest_kaggle",
+        "func": ingest_kaggle,
+        "outputs": [Config.BRONZE_PATHS["kaggle"]],
+        "params": {"dataset": KAGGLE_DATASET, "format": Config.KAGGLE_BRONZE_FORMAT},
+    },
+]
+
+# Downstream stages, in dependency order. Each one is re-run only when its lineage is stale.
+TRANSFORM_STAGES = [
+    {
+        "stage": "transform_fred_to_silver",
+        "func": lambda: transform_fred_to_silver(start_date=FRED_START_DATE),
+        "inputs": FRED_BRONZE_FILES,
+        "outputs": [os.path.join(MACRO_SILVER_PATH, "cleaned_macro_indicators.csv")],
+        "params": {"start_date": FRED_START_DATE},
+    },
+    {
+        "stage": "transform_kaggle_to_silver",
+        "func": lambda: transform_to_silver_kaggle(Config.BRONZE_PATHS["kaggle"], KAGGLE_SILVER_PATH),
+        "inputs": [Config.BRONZE_PATHS["kaggle"]],
+        "outputs": [KAGGLE_SILVER_PATH],
+        "params": {"bronze_path": Config.BRONZE_PATHS["kaggle"], "silver_path": KAGGLE_SILVER_PATH},
+    },
+    {
+        "stage": "market_metrics",
+        "func": build_market_metrics,
+        "inputs": [MARKET_INDEX_FILE],
+        "outputs": [MARKET_METRICS_PATH],
+        "params": {"prefix": "processed_"},
+    },
+]
+
+
+def stale_stages(index: LineageIndex) -> dict:
+    return {
+        spec["stage"]: reasons
+        for spec in TRANSFORM_STAGES
+        if (reasons := index.stale_reasons(spec["stage"], spec["inputs"], spec["outputs"], spec["params"]))
+    }
+
 
 def main():
+    parser = argparse.ArgumentParser(description="Run the Mercury data pipeline.")
+    parser.add_argument("--force", action="store_true", help="Re-run every stage, even if up to date.")
+    parser.add_argument("--stale", action="store_true", help="List stale stages and exit.")
+    args = parser.parse_args()
+
+    index = LineageIndex()
+    if args.stale:
+        for stage, reasons in stale_stages(index).items():
+            logging.info(f"{stage}: {'; '.join(reasons)}")
+        return
+
     logging.info("Starting the data pipeline...")
-    ingest_fred()
+    for spec in INGEST_STAGES:
+        started_at = time.time()
+        if not spec["func"]():
+            logging.error(f"[{spec['stage']}] Failed. Not recording this run.")
+            continue
+        index.record(spec["stage"], inputs=[], outputs=spec["outputs"], params=spec["params"],
+                     started_at=started_at, finished_at=time.time())
+
+    for spec in TRANSFORM_STAGES:
+        if not all(os.path.exists(path) for path in spec["inputs"]):
+            logging.warning(f"[{spec['stage']}] Inputs not available. Skipping.")
+            continue
+        run_stage(spec["stage"], spec["func"], spec["inputs"], spec["outputs"], spec["params"],
+                  index=index, force=args.force)
+
+    index.prune()
     logging.info("Pipeline completed!")
 
 
 if __name__ == "__main__":
     main()
-    
\ No newline at end of file
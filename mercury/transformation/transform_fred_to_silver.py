@@ -18,7 +18,7 @@ BRONZE_PATH = Config.BRONZE_PATHS["fred"]
 SILVER_PATH = os.path.join(Config.DATA_LAKE_PATHS["silver"], "macro")
 
 
-def transform_fred_to_silver():
+def transform_fred_to_silver(start_date: str = "1995-01-01") -> bool:
     # Paths to raw FRED data
     gdp_file = os.path.join(BRONZE_PATH, "raw_GDP.csv")
     cpi_file = os.path.join(BRONZE_PATH, "raw_CPIAUCSL.csv")
@@ -71,16 +71,17 @@ def transform_fred_to_silver():
     # Sort by Date after merging
     df_merged.sort_values("Date", inplace=True)
 
-    # Filter data to include only rows after 01/01/1995
-    start_date = pd.Timestamp("1995-01-01")
-    df_merged = df_merged[df_merged["Date"] >= start_date]
+    # Filter data to include only rows from the start date onwards
+    df_merged = df_merged[df_merged["Date"] >= pd.Timestamp(start_date)]
 
     if df_merged.empty:
-        logging.warning("No data available after 1995-01-01. Skipping save.")
+        logging.warning(f"No data available after {start_date}. Skipping save.")
+        return False
     else:
         # Save final dataset to silver
         save_csv(df_merged, path=SILVER_PATH, file_name="cleaned_macro_indicators.csv")
         logging.info("Transformation to silver (macro) completed successfully.")
+        return True
 
 
 if __name__ == "__main__":
@@ -1,6 +1,7 @@
 import os
 import pandas as pd
 from mercury.config import Config
+from mercury.utils import load_table
 
 
 def handle_companies_data(df):
@@ -67,18 +68,19 @@ def transform_to_silver_kaggle(bronze_path, silver_path):
         "sp500_index": handle_index_data,
     }
 
+    success = True
     for file in os.listdir(bronze_path):
-        if file.endswith(".csv"):
+        if file.endswith((".csv", ".parquet")):
             try:
                 bronze_file_path = os.path.join(bronze_path, file)
 
                 # Standardize filename: Replace `raw_` with `cleaned_`
-                cleaned_file_name = f"cleaned_{file.removeprefix('raw_')}"
+                cleaned_file_name = f"cleaned_{os.path.splitext(file)[0].removeprefix('raw_')}.csv"
                 silver_file_path = os.path.join(silver_path, cleaned_file_name)
 
                 # Process dataset
                 print(f"Processing: {bronze_file_path}")
-                df = pd.read_csv(bronze_file_path)
+                df = load_table(bronze_file_path)
 
                 # Identify and process files based on their type
                 for key, handler in handlers.items():
@@ -92,6 +94,7 @@ def transform_to_silver_kaggle(bronze_path, silver_path):
                 # Validate that data isn't empty post-cleaning
                 if df.empty:
                     print(f"No valid data remaining in '{file}'. Skipping...\n")
+                    success = False
                     continue
 
                 # Save cleaned dataset
@@ -100,6 +103,9 @@ def transform_to_silver_kaggle(bronze_path, silver_path):
 
             except Exception as e:
                 print(f"Error processing '{file}': {e}\n")
+                success = False
+
+    return success
 
 
 if __name__ == "__main__":
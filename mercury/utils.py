@@ -1,4 +1,5 @@
 import os
+import hashlib
 import pandas as pd
 import logging
 from pathlib import Path
@@ -19,6 +20,14 @@ def validate_path(file_path: str) -> str:
     return file_path
 
 
+def file_sha256(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
 def load_csv(file_path: str) -> pd.DataFrame:
     try:
         df = pd.read_csv(validate_path(file_path))
@@ -29,6 +38,18 @@ def load_csv(file_path: str) -> pd.DataFrame:
         raise
 
 
+def load_table(file_path: str) -> pd.DataFrame:
+    if not file_path.endswith(".parquet"):
+        return load_csv(file_path)
+    try:
+        df = pd.read_parquet(validate_path(file_path))
+        logging.info(f"Loaded {len(df)} rows from '{file_path}'")
+        return df
+    except Exception as e:
+        logging.error(f"Failed to load Parquet '{file_path}': {e}")
+        raise
+
+
 def clean_dataframe(df: pd.DataFrame, date_col: str = "Date", value_col: str = "Value") -> pd.DataFrame:
     try:
         df[date_col] = pd.to_datetime(df[date_col], errors="coerce")
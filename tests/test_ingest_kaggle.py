@@ -0,0 +1,104 @@
+import os
+import zipfile
+import pandas as pd
+import pytest
+from mercury.config import Config
+from mercury.ingestion import ingest_kaggle as kaggle
+from mercury.ingestion.provider_cache import ProviderCache
+from mercury.transformation.transform_kaggle_to_silver import transform_to_silver_kaggle
+
+COMPANIES_CSV = (
+    "Exchange,Symbol,Shortname,Longname,Sector,Industry,Currentprice,Marketcap,Ebitda,Revenuegrowth,"
+    "City,State,Country,Fulltimeemployees,Longbusinesssummary,Weight\n"
+    'NMS,AAA,Aaa Inc,Aaa Incorporated,Technology,Software,12.5,1000,,0.1,Austin,,United States,50,'
+    '"Makes software,\nacross lines",0.01\n'
+)
+INDEX_CSV = "Date,S&P500\n2020-01-01,3230.78\n2020-01-02,3257.85\n"
+
+
+@pytest.fixture
+def recorded_archive(tmp_path, monkeypatch):
+    """Record an archive in the provider cache and replay it offline."""
+    bronze_path = tmp_path / "bronze" / "kaggle"
+    monkeypatch.setattr(Config, "CACHE_PATH", str(tmp_path / "cache"))
+    monkeypatch.setitem(Config.BRONZE_PATHS, "kaggle", str(bronze_path))
+
+    def record(members: dict) -> None:
+        def write_archive(target_path):
+            with zipfile.ZipFile(target_path, "w") as archive:
+                for name, content in members.items():
+                    archive.writestr(name, content)
+
+        ProviderCache("kaggle", mode="refresh").fetch({"dataset": kaggle.DATASET}, loader=write_archive)
+        monkeypatch.setattr(Config, "CACHE_MODE", "offline")
+
+    return bronze_path, record
+
+
+def test_extract_member_streams_csv_under_final_name(tmp_path):
+    archive_path = tmp_path / "archive.zip"
+    with zipfile.ZipFile(archive_path, "w") as archive:
+        archive.writestr("data/sp500_index.csv", INDEX_CSV)
+
+    with zipfile.ZipFile(archive_path) as archive:
+        file_name = kaggle.extract_member(archive, archive.infolist()[0], str(tmp_path), "csv")
+
+    assert file_name == "raw_sp500_index.csv"
+    assert (tmp_path / file_name).read_text() == INDEX_CSV
+    assert not (tmp_path / f"{file_name}.tmp").exists()
+
+
+def test_parquet_types_are_pinned_beyond_the_first_block(tmp_path):
+    # Enough empty rows to push the first value past Arrow's first inference block
+    rows = ["Date,Symbol,Adj Close,Close,High,Low,Open,Volume"]
+    rows += ["2010-01-04,AAA,,,,,,"] * 80000
+    rows += ["2020-01-02,BBB,12.5,12.5,13,12,12,100"]
+    archive_path = tmp_path / "archive.zip"
+    with zipfile.ZipFile(archive_path, "w") as archive:
+        archive.writestr("sp500_stocks.csv", "\n".join(rows) + "\n")
+
+    with zipfile.ZipFile(archive_path) as archive:
+        file_name = kaggle.extract_member(archive, archive.infolist()[0], str(tmp_path), "parquet")
+
+    df = pd.read_parquet(tmp_path / file_name)
+    assert len(df) == 80001
+    assert df["Close"].iloc[-1] == 12.5
+    assert df["Symbol"].iloc[-1] == "BBB"
+
+
+def test_unchanged_archive_is_not_extracted_again(recorded_archive, monkeypatch):
+    bronze_path, record = recorded_archive
+    record({"sp500_index.csv": INDEX_CSV})
+    assert kaggle.ingest_kaggle(file_format="csv") is True
+
+    def fail(*args, **kwargs):
+        raise AssertionError("extract_member should not run for an unchanged archive")
+
+    monkeypatch.setattr(kaggle, "extract_member", fail)
+    assert kaggle.ingest_kaggle(file_format="csv") is True
+    assert (bronze_path / "raw_sp500_index.csv").exists()
+
+
+def test_format_switch_removes_previous_files(recorded_archive):
+    bronze_path, record = recorded_archive
+    record({"sp500_index.csv": INDEX_CSV})
+
+    assert kaggle.ingest_kaggle(file_format="csv") is True
+    assert kaggle.ingest_kaggle(file_format="parquet") is True
+
+    assert sorted(f for f in os.listdir(bronze_path) if not f.startswith("_")) == ["raw_sp500_index.parquet"]
+
+
+def test_csv_and_parquet_bronze_produce_the_same_silver(recorded_archive, tmp_path):
+    bronze_path, record = recorded_archive
+    record({"sp500_companies.csv": COMPANIES_CSV})
+
+    silver = {}
+    for file_format in ("csv", "parquet"):
+        assert kaggle.ingest_kaggle(file_format=file_format) is True
+        silver_path = tmp_path / "silver" / file_format
+        transform_to_silver_kaggle(str(bronze_path), str(silver_path))
+        silver[file_format] = pd.read_csv(silver_path / "cleaned_sp500_companies.csv")
+
+    assert silver["csv"]["State"].tolist() == ["Unknown"]
+    pd.testing.assert_frame_equal(silver["csv"], silver["parquet"], check_dtype=False)
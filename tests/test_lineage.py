@@ -0,0 +1,121 @@
+import os
+import sys
+from mercury.config import Config
+from mercury.lineage import LineageIndex, count_rows, run_stage
+from mercury.transformation.transform_kaggle_to_silver import transform_to_silver_kaggle
+
+
+def write_outputs(out_dir):
+    out_dir.mkdir(exist_ok=True)
+    (out_dir / "c1.csv").write_text("a\n1\n")
+    (out_dir / "c2.csv").write_text("a\n2\n")
+    return True
+
+
+def test_deleted_output_in_directory_marks_stage_stale(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "BASE_PATH", str(tmp_path))
+    index = LineageIndex(str(tmp_path / "_lineage"))
+    out_dir = tmp_path / "out"
+
+    run_stage("stage", lambda: write_outputs(out_dir), inputs=[], outputs=[str(out_dir)], index=index)
+    assert index.stale_reasons("stage", [], [str(out_dir)]) == []
+
+    (out_dir / "c2.csv").unlink()
+    assert index.stale_reasons("stage", [], [str(out_dir)]) == [f"output missing: {out_dir / 'c2.csv'}"]
+
+
+def test_stage_is_skipped_until_inputs_change(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "BASE_PATH", str(tmp_path))
+    index = LineageIndex(str(tmp_path / "_lineage"))
+    source, out_dir = tmp_path / "source.csv", tmp_path / "out"
+    source.write_text("a\n1\n")
+
+    def stage():
+        return run_stage("stage", lambda: write_outputs(out_dir), [str(source)], [str(out_dir)], index=index)
+
+    assert stage() is True
+    assert stage() is False
+    source.write_text("a\n2\n")
+    assert stage() is True
+
+
+def test_count_rows_handles_missing_trailing_newline_and_quoted_newlines(tmp_path):
+    no_newline = tmp_path / "no_newline.csv"
+    no_newline.write_text("x\n1")
+    quoted = tmp_path / "quoted.csv"
+    quoted.write_text('Symbol,Summary\nAAA,"line one\nline two"\nBBB,short\n')
+
+    assert count_rows(str(no_newline)) == 1
+    assert count_rows(str(quoted)) == 2
+
+
+def test_failed_transform_is_not_recorded(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "BASE_PATH", str(tmp_path))
+    index = LineageIndex(str(tmp_path / "_lineage"))
+    bronze, silver = tmp_path / "bronze", tmp_path / "silver"
+    bronze.mkdir()
+    (bronze / "raw_sp500_index.csv").write_text("Date,S&P500\n2020-01-01,3230.78\n")
+
+    def stage():
+        return run_stage("transform", lambda: transform_to_silver_kaggle(str(bronze), str(silver)),
+                         [str(bronze)], [str(silver)], index=index)
+
+    assert stage() is True
+    previous_silver = (silver / "cleaned_sp500_index.csv").read_text()
+
+    # A schema change makes the index handler raise; the old silver file is left in place
+    (bronze / "raw_sp500_index.csv").write_text("Day,S&P500\n2020-01-02,3257.85\n")
+    assert stage() is False
+    assert (silver / "cleaned_sp500_index.csv").read_text() == previous_silver
+    assert index.stale_reasons("transform", [str(bronze)], [str(silver)]) != []
+    assert len(index.entries("transform")) == 1
+
+
+def test_raising_stage_is_not_recorded(tmp_path):
+    index = LineageIndex(str(tmp_path / "_lineage"))
+
+    def fail():
+        raise ValueError("boom")
+
+    assert run_stage("stage", fail, [], [str(tmp_path / "out.csv")], index=index) is False
+    assert index.entries() == []
+
+
+def test_prune_keeps_newest_entries_and_their_snapshots(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "BASE_PATH", str(tmp_path))
+    index = LineageIndex(str(tmp_path / "_lineage"))
+    output = tmp_path / "out.csv"
+
+    for version in range(5):
+        output.write_text(f"a\n{version}\n")
+        index.record("stage", [], [str(output)])
+    index.prune(limit=2)
+
+    kept = [e["outputs"][0]["snapshot"] for e in index.entries("stage")]
+    assert [open(path).read() for path in kept] == ["a\n3\n", "a\n4\n"]
+    dataset_dir = os.path.dirname(kept[0])
+    assert sorted(os.path.join(dataset_dir, f) for f in os.listdir(dataset_dir)) == sorted(kept)
+
+
+def test_prune_keeps_snapshots_referenced_by_kept_entries_only(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "BASE_PATH", str(tmp_path))
+    index = LineageIndex(str(tmp_path / "_lineage"))
+    output = tmp_path / "out.csv"
+
+    # Two stages write the same dataset; the older stage's only version must survive
+    output.write_text("a\n0\n")
+    index.record("backfill", [], [str(output)])
+    for version in range(1, 4):
+        output.write_text(f"a\n{version}\n")
+        index.record("stage", [], [str(output)])
+    index.prune(limit=2)
+
+    kept = [o["snapshot"] for e in index.entries() for o in e["outputs"]]
+    assert [open(path).read() for path in kept] == ["a\n0\n", "a\n2\n", "a\n3\n"]
+    assert len(os.listdir(os.path.dirname(kept[0]))) == 3
+
+
+def test_pipeline_imports_without_kaggle():
+    import mercury.main  # noqa: F401
+
+    assert "kaggle" not in sys.modules
@@ -0,0 +1,115 @@
+import os
+import zipfile
+import pandas as pd
+import pytest
+from mercury.config import Config
+from mercury.ingestion.provider_cache import ProviderCache, CacheMissError
+
+
+class CountingLoader:
+    def __init__(self, payload: bytes = b"x" * 100):
+        self.payload = payload
+        self.calls = 0
+
+    def __call__(self, target_path: str) -> None:
+        self.calls += 1
+        with open(target_path, "wb") as f:
+            f.write(self.payload)
+
+
+def test_fresh_entry_is_served_from_cache(tmp_path):
+    cache = ProviderCache("test", cache_dir=str(tmp_path), ttl=3600)
+    loader = CountingLoader()
+
+    first = cache.fetch({"id": 1}, loader)
+    second = cache.fetch({"id": 1}, loader)
+
+    assert first == second
+    assert loader.calls == 1
+
+
+def test_expired_entry_with_unchanged_validator_is_revalidated(tmp_path):
+    cache = ProviderCache("test", cache_dir=str(tmp_path), ttl=0)
+    loader = CountingLoader()
+
+    cache.fetch({"id": 1}, loader, validator=lambda: "v1")
+    cache.fetch({"id": 1}, loader, validator=lambda: "v1")
+
+    assert loader.calls == 1
+
+
+def test_expired_entry_with_changed_validator_is_refetched(tmp_path):
+    cache = ProviderCache("test", cache_dir=str(tmp_path), ttl=0)
+    loader = CountingLoader()
+
+    cache.fetch({"id": 1}, loader, validator=lambda: "v1")
+    cache.fetch({"id": 1}, loader, validator=lambda: "v2")
+
+    assert loader.calls == 2
+    assert cache.lookup({"id": 1})["validator"] == "v2"
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ProviderCache("test", cache_dir=str(tmp_path), ttl=3600, max_bytes=250)
+    loader = CountingLoader()
+
+    cache.fetch({"id": 1}, loader)
+    cache.fetch({"id": 2}, loader)
+    cache.fetch({"id": 1}, loader)  # Touch 1 so that 2 becomes least recently used
+    cache.fetch({"id": 3}, loader)
+
+    assert cache.lookup({"id": 1}) is not None
+    assert cache.lookup({"id": 2}) is None
+    assert cache.lookup({"id": 3}) is not None
+
+
+def test_offline_mode_replays_and_raises_on_miss(tmp_path):
+    ProviderCache("test", cache_dir=str(tmp_path)).fetch({"id": 1}, CountingLoader())
+    offline = ProviderCache("test", cache_dir=str(tmp_path), ttl=0, mode="offline")
+    loader = CountingLoader()
+
+    assert os.path.exists(offline.fetch({"id": 1}, loader))
+    with pytest.raises(CacheMissError):
+        offline.fetch({"id": 2}, loader)
+    assert loader.calls == 0
+
+
+def test_ingest_fred_runs_offline_from_recorded_responses(tmp_path, monkeypatch):
+    from mercury.ingestion.ingest_fred import ingest_fred
+
+    bronze_path = tmp_path / "bronze" / "fred"
+    monkeypatch.setattr(Config, "CACHE_PATH", str(tmp_path / "cache"))
+    monkeypatch.setitem(Config.BRONZE_PATHS, "fred", str(bronze_path))
+    monkeypatch.setattr(Config, "INDICATORS", ["GDP", "UNRATE"])
+    monkeypatch.delenv("FRED_API_KEY", raising=False)
+
+    recorder = ProviderCache("fred", mode="refresh")
+    for indicator in Config.INDICATORS:
+        series = pd.Series([1.0, 2.0], index=pd.to_datetime(["2020-01-01", "2020-02-01"]))
+        recorder.fetch({"series_id": indicator}, loader=series.to_pickle)
+
+    monkeypatch.setattr(Config, "CACHE_MODE", "offline")
+    ingest_fred()
+
+    for indicator in Config.INDICATORS:
+        df = pd.read_csv(bronze_path / f"raw_{indicator}.csv")
+        assert list(df.columns) == ["Date", "Value"]
+        assert df["Value"].tolist() == [1.0, 2.0]
+
+
+def test_ingest_kaggle_runs_offline_from_recorded_archive(tmp_path, monkeypatch):
+    from mercury.ingestion.ingest_kaggle import ingest_kaggle, DATASET
+
+    bronze_path = tmp_path / "bronze" / "kaggle"
+    monkeypatch.setattr(Config, "CACHE_PATH", str(tmp_path / "cache"))
+    monkeypatch.setitem(Config.BRONZE_PATHS, "kaggle", str(bronze_path))
+
+    def record_archive(target_path):
+        with zipfile.ZipFile(target_path, "w") as archive:
+            archive.writestr("sp500_index.csv", "Date,S&P500\n2020-01-01,3230.78\n")
+
+    ProviderCache("kaggle", mode="refresh").fetch({"dataset": DATASET}, loader=record_archive)
+
+    monkeypatch.setattr(Config, "CACHE_MODE", "offline")
+    assert ingest_kaggle(file_format="csv") is True
+    assert (bronze_path / "raw_sp500_index.csv").read_text() == "Date,S&P500\n2020-01-01,3230.78\n"